@@ -34,6 +34,11 @@ A backend is a mapping (plain `dict`) with these callables:
 - simulate_step(state: dict) -> tuple[dict, dict]
     Advance the simulation one tick and return (new_state, metrics).
 
+Optionally also:
+
+- export_records(state: dict) -> None
+    Refresh `state["drivers"]` / `state["pending"]` before the UI reads them.
+
 Usage
 -----
 Run directly:
@@ -55,6 +60,7 @@ Notes
 # import phase1
 from __future__ import annotations
 
+from functools import partial
 from typing import Optional, Dict, Callable, Tuple, Any
 from gui._engine import run_app
 
@@ -91,12 +97,13 @@ if __name__ == "__main__":
         from phase1 import io_mod, sim_mod  # type: ignore
 
         _backend = {
-            "load_drivers": io_mod.load_drivers,
-            "load_requests": io_mod.load_requests,
-            "generate_drivers": io_mod.generate_drivers,
+            "load_drivers": partial(io_mod.load_drivers, legacy=True),
+            "load_requests": partial(io_mod.load_requests, legacy=True),
+            "generate_drivers": partial(io_mod.generate_drivers, legacy=True),
             "generate_requests": io_mod.generate_requests,
             "init_state": sim_mod.init_state,
             "simulate_step": sim_mod.simulate_step,
+            "export_records": sim_mod.export_records,
         }
     except Exception:
         _backend = None
@@ -24,7 +24,8 @@ Architecture
 
 2. Procedural backend (no classes/objects)
    - A backend is a ``BackendFns`` mapping of required function names to
-     callables: load/generate I/O, ``init_state`` and ``simulate_step``.
+     callables: load/generate I/O, ``init_state`` and ``simulate_step``,
+     plus the optional ``export_records`` hook.
    - ``make_default_backend()`` wires to ``phase1.io_mod`` and
      ``phase1.sim_mod`` so students can run without writing their own backend.
 
@@ -61,17 +62,32 @@ Notes
   to match your data.
 * The simulator is expected to accept and return a state ``dict`` compatible
   with the keys used here (``t``, ``drivers``, ``pending``, etc.).
-* The Run button uses a blocking loop but remains visually
-  responsive thanks to ``dpg.split_frame()`` each iteration (it took me ages to get this).
+* While running, a background thread advances the simulation at the chosen
+  speed (see ``_sim_worker``) and a self-re-arming frame callback redraws the
+  latest state it published, so DearPyGui's own loop (``dpg.start_dearpygui()``)
+  drives rendering. ``APP.lock`` serializes every access to the simulator state.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Optional, Tuple, TypedDict
-import math
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypedDict
+import queue
+import threading
 import time
 
 import dearpygui.dearpygui as dpg
+import numpy as np
+
+try:  # optional: KD-tree for the nearest-pending fallback
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+try:  # optional: compiled arrow kernel (see ``_quiver_kernel``)
+    from numba import njit
+except ImportError:
+    njit = None
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -79,7 +95,21 @@ import dearpygui.dearpygui as dpg
 GRID_WIDTH: int = 50
 GRID_HEIGHT: int = 30
 ARROW_LENGTH: float = 1.0  # visual length of direction arrows
+ARROW_COLOR = (128, 128, 128, 160)
+ARROW_PREALLOC: int = 50   # arrow items created up front (max of the "# Drivers" slider)
 EPS: float = 1e-9          # small epsilon for numeric stability
+EPS2: float = EPS * EPS    # same, for squared lengths
+KDTREE_MIN_PAIRS: int = 50_000  # below this many (driver, request) pairs brute force is faster
+
+# Setup inputs read by ``_on_init`` (in this order)
+INIT_INPUTS = ("use_files", "drivers_path", "requests_path", "n_drivers", "req_rate", "horizon", "timeout")
+
+# Request statuses drawn as pickups / dropoffs. Backends may use the names or
+# the integer codes of ``phase1.io_mod`` (0 waiting, 1 assigned, 3 picked).
+PICKUP_CODES = (0, 1)
+DROPOFF_CODES = (3,)
+PICKUP_STATUSES = frozenset({"waiting", "assigned", *PICKUP_CODES})
+DROPOFF_STATUSES = frozenset({"picked", *DROPOFF_CODES})
 
 
 # ---------------------------------------------------------------------------
@@ -97,8 +127,8 @@ class AppSimState:
       - ``drivers`` (list[dict]): driver entities with at least ``x``, ``y``;
         optionally ``vx``, ``vy``, ``tx``, ``ty``, ``target_id``/``rid``
       - ``pending`` (list[dict]): request entities with pickup ``(px,py)``,
-        dropoff ``(dx,dy)``, a ``status`` in {"waiting","assigned","picked"},
-        and possibly an appearance time ``t``
+        dropoff ``(dx,dy)``, a ``status`` in {"waiting","assigned","picked"}
+        (or the matching integer code), and possibly an appearance time ``t``
       - ``served`` (int), ``expired`` (int): counters
     """
 
@@ -122,14 +152,14 @@ class AppSimState:
         self.sim["t"] = int(value)
 
     @property
-    def drivers(self) -> List[dict]:
-        """Shallow copy of driver list to avoid accidental mutation."""
-        return list(self.sim.get("drivers", []))
+    def drivers(self) -> Sequence[dict]:
+        """The simulator's driver list itself (not a copy): read it, don't mutate it."""
+        return self.sim.get("drivers", ())
 
     @property
-    def pending(self) -> List[dict]:
-        """Shallow copy of pending request list."""
-        return list(self.sim.get("pending", []))
+    def pending(self) -> Sequence[dict]:
+        """The simulator's pending request list itself (not a copy): read only."""
+        return self.sim.get("pending", ())
 
     @property
     def served(self) -> int:
@@ -146,10 +176,26 @@ class AppSimState:
 class RuntimeState:
     """UI runtime state (separate from the simulator state)."""
 
-    running: bool = False
+    run_event: threading.Event = field(default_factory=threading.Event)  # set while running
     speed: int = 30           # ms per sim step (UI pacing)
+    period_s: float = 0.030   # ``speed`` in seconds, kept in sync by ``_on_speed_change``
     clock: int = 0            # mirrors AppSimState.t for rendering
     horizon: int = 600        # max simulated time
+    arrow_pool: List[int] = field(default_factory=list)  # arrow line item ids under "dir_draw"
+    arrows_shown: int = 0     # of which the first ``arrows_shown`` are visible
+    status_key: Optional[Tuple] = None  # (t, served, expired, avg_wait) last shown
+
+    @property
+    def running(self) -> bool:
+        """Whether the simulation worker should advance (mirrors ``run_event``)."""
+        return self.run_event.is_set()
+
+    @running.setter
+    def running(self, value: bool) -> None:
+        if value:
+            self.run_event.set()
+        else:
+            self.run_event.clear()
 
 
 @dataclass
@@ -158,6 +204,17 @@ class AppContext:
 
     state: AppSimState = field(default_factory=AppSimState)
     rt: RuntimeState = field(default_factory=RuntimeState)
+    # float32 NumPy view of ``state`` for plotting (see ``_build_coords``),
+    # rebuilt by ``_adapter_sync`` right before a redraw, not after every step
+    coords: Dict[str, np.ndarray] = field(default_factory=dict)
+    # pending requests by id, rebuilt together with ``coords``
+    pending_by_id: Dict = field(default_factory=dict)
+    # set when the simulator state changed since ``coords`` were built
+    dirty: bool = False
+    # held while stepping or reading the simulator state (UI vs. sim worker)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # DearPyGui int ids of the setup inputs, resolved once in ``run_app``
+    ui_ids: Dict[str, int] = field(default_factory=dict)
 
 
 # Global application context (single instance used by the UI)
@@ -167,7 +224,13 @@ APP = AppContext()
 # ---------------------------------------------------------------------------
 # Procedural backend interface
 # ---------------------------------------------------------------------------
-class BackendFns(TypedDict):
+class _OptionalBackendFns(TypedDict, total=False):
+    """Optional backend callables (see ``BackendFns``)."""
+
+    export_records: Callable[[Dict], None]
+
+
+class BackendFns(_OptionalBackendFns):
     """Typed mapping of required backend callables.
 
     Students can implement these as plain functions and pass them via a dict
@@ -193,6 +256,12 @@ class BackendFns(TypedDict):
     simulate_step(state) -> (state, metrics)
         Advance the simulation by one step and return updated ``state`` and a
         ``metrics`` dict (e.g., ``{"served": int, "expired": int, "avg_wait": float}``).
+
+    Optional functions
+    ------------------
+    export_records(state) -> None
+        Refresh ``state["drivers"]``/``state["pending"]`` before they are read.
+        For simulators that do not keep these lists current on every step.
     """
 
     load_drivers: Callable[[str], List[dict]]
@@ -212,13 +281,15 @@ def make_default_backend() -> BackendFns:
     from phase1 import io_mod
     from phase1 import sim_mod
 
+    # the UI works on lists of dictionaries, so ask the loaders and generator for those
     return BackendFns(
-        load_drivers=io_mod.load_drivers,
-        load_requests=io_mod.load_requests,
-        generate_drivers=io_mod.generate_drivers,
+        load_drivers=partial(io_mod.load_drivers, legacy=True),
+        load_requests=partial(io_mod.load_requests, legacy=True),
+        generate_drivers=partial(io_mod.generate_drivers, legacy=True),
         generate_requests=io_mod.generate_requests,
         init_state=sim_mod.init_state,
         simulate_step=sim_mod.simulate_step,
+        export_records=sim_mod.export_records,
     )
 
 
@@ -229,75 +300,214 @@ def _find_request_by_id(req_id: Optional[int | str]) -> Optional[dict]:
     """Return the pending request whose id matches ``req_id``.
 
     Accepts ``id``, ``rid``, or ``req_id`` keys on request dictionaries. If the
-    id is ``None`` or not found, returns ``None``.
+    id is ``None`` or not found, returns ``None``. Looks up ``APP.pending_by_id``.
     """
     if req_id is None:
         return None
-    for r in APP.state.pending:
-        if r.get("id", r.get("rid", r.get("req_id"))) == req_id:
-            return r
-    return None
+    return APP.pending_by_id.get(req_id)
 
 
-def _infer_direction_from_driver(d: dict) -> Tuple[float, float]:
+def _infer_direction_from_driver(
+    d: dict, x: Optional[float] = None, y: Optional[float] = None, _float=float
+) -> Optional[Tuple[float, float]]:
     """Infer an unscaled direction vector ``(ux, uy)`` for a driver ``d``.
 
+    ``x``/``y`` is the driver position if the caller already read it.
+
     Priority order:
       1) use explicit velocity (``vx``, ``vy``) if present
       2) else use explicit target position (``tx``, ``ty``)
       3) else use ``target_id``/``rid`` to find a request and aim at its pickup
-      4) else aim at the nearest pending request (if any)
-      5) else return ``(0.0, 0.0)``
+      4) else return ``None``: the caller aims at the nearest pending request
+         (if any) for all such drivers at once, see ``_build_coords``
     """
-    x, y = float(d.get("x", 0.0)), float(d.get("y", 0.0))
-
-    # 1) explicit velocity
+    # 1) explicit velocity (needs no position)
     if "vx" in d and "vy" in d:
-        return float(d["vx"]), float(d["vy"])
+        return _float(d["vx"]), _float(d["vy"])
+
+    get = d.get
+    if x is None or y is None:
+        x, y = _float(get("x", 0.0)), _float(get("y", 0.0))
 
     # 2) explicit target position
-    tx, ty = d.get("tx"), d.get("ty")
+    tx, ty = get("tx"), get("ty")
     if tx is not None and ty is not None:
-        return float(tx) - x, float(ty) - y
+        return _float(tx) - x, _float(ty) - y
 
     # 3) pointer to a request
-    tgt_id = d.get("target_id", d.get("rid"))
+    tgt_id = get("target_id", get("rid"))
     req = _find_request_by_id(tgt_id)
     if req is not None:
         px, py = req.get("px"), req.get("py")
         if px is not None and py is not None:
-            return float(px) - x, float(py) - y
+            return _float(px) - x, _float(py) - y
+
+    # 4) left to the vectorised nearest-pending fallback
+    return None
+
 
-    # 4) fallback: nearest pending request
-    pend = APP.state.pending
-    if pend:
-        nearest = min(
-            pend,
-            key=lambda r: (float(r.get("px", 0.0)) - x) ** 2 + (float(r.get("py", 0.0)) - y) ** 2,
-        )
-        px, py = float(nearest.get("px", 0.0)), float(nearest.get("py", 0.0))
-        return px - x, py - y
+def _normalize_and_scale(
+    ux: np.ndarray, uy: np.ndarray, length: float = ARROW_LENGTH
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the vectors ``(ux, uy)`` normalized and scaled to ``length``.
 
-    # 5) no target
-    return 0.0, 0.0
+    Vectors that are near zero become ``(0.0, 0.0)`` to avoid exploding arrows.
+    """
+    # squared norm + one sqrt, no per-element branch (hypot guards overflow we can't hit)
+    n2 = ux * ux + uy * uy
+    s = np.where(n2 < EPS2, 0.0, length / np.sqrt(np.maximum(n2, EPS2)))
+    return ux * s, uy * s
 
 
-def _normalize_and_scale(vec: Tuple[float, float], length: float = ARROW_LENGTH) -> Tuple[float, float]:
-    """Return ``vec`` normalized and scaled to a target ``length``.
+def _nearest_index(px: np.ndarray, py: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Return, for every point ``(x[i], y[i])``, the index of the nearest ``(px, py)``.
 
-    If ``vec`` is near zero, returns ``(0.0, 0.0)`` to avoid exploding arrows.
+    Uses SciPy's ``cKDTree`` (O(n log m)) when installed and the problem is
+    large enough, else a brute-force O(n*m) NumPy ``argmin``.
+    """
+    if cKDTree is not None and px.size * x.size >= KDTREE_MIN_PAIRS:
+        _, idx = cKDTree(np.column_stack((px, py))).query(np.column_stack((x, y)), k=1)
+        return idx
+    dx = px[None, :] - x[:, None]
+    dy = py[None, :] - y[:, None]
+    return (dx * dx + dy * dy).argmin(axis=1)
+
+
+def _quiver_numpy(drv_x, drv_y, ux, uy, fallback, px, py, length, eps2, out) -> None:
+    """Fill ``out`` (D, 4) with rows ``(x, y, u, v)``: each driver's direction
+    ``(ux, uy)`` scaled to ``length``; rows flagged in ``fallback`` aim at the
+    nearest pending pickup ``(px, py)`` instead (or get no arrow). ``eps2`` is
+    the squared zero-length cutoff (``EPS2`` in ``_normalize_and_scale``).
+    """
+    ux, uy = ux.copy(), uy.copy()
+    rest = np.flatnonzero(fallback)
+    if rest.size and px.size:
+        idx = _nearest_index(px, py, drv_x[rest], drv_y[rest])
+        ux[rest] = px[idx] - drv_x[rest]
+        uy[rest] = py[idx] - drv_y[rest]
+    else:
+        ux[rest] = 0.0
+        uy[rest] = 0.0
+    out[:, 0] = drv_x
+    out[:, 1] = drv_y
+    out[:, 2], out[:, 3] = _normalize_and_scale(ux, uy, length)
+
+
+def _quiver_loop(drv_x, drv_y, ux, uy, fallback, px, py, length, eps2, out) -> None:
+    """``_quiver_numpy`` as one loop over the drivers, compiled by numba."""
+    for i in range(drv_x.size):
+        x, y = drv_x[i], drv_y[i]
+        u, v = ux[i], uy[i]
+        if fallback[i]:
+            u = v = 0.0
+            best = np.inf
+            for k in range(px.size):  # nearest pending pickup, first one on ties
+                du, dv = px[k] - x, py[k] - y
+                d2 = du * du + dv * dv
+                if d2 < best:
+                    best, u, v = d2, du, dv
+        n2 = u * u + v * v
+        s = 0.0 if n2 < eps2 else length / np.sqrt(n2)
+        out[i, 0] = x
+        out[i, 1] = y
+        out[i, 2] = u * s
+        out[i, 3] = v * s
+
+
+# fastmath without "nnan"/"ninf": the nearest-pickup search starts from np.inf
+# and the fallback rows carry NaN directions, so neither may be assumed away.
+_QUIVER_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+_quiver_kernel = (
+    njit(cache=True, fastmath=_QUIVER_FASTMATH)(_quiver_loop) if njit is not None else _quiver_numpy
+)
+
+
+def _xy(records: Sequence[dict], kx: str, ky: str) -> np.ndarray:
+    """Return the ``kx``/``ky`` values of ``records`` as an (N, 2) float32 array (missing: 0.0)."""
+    return np.asarray([(r.get(kx, 0.0), r.get(ky, 0.0)) for r in records], dtype=np.float32).reshape(-1, 2)
+
+
+def _build_coords() -> Dict[str, np.ndarray]:
+    """Return the current state as NumPy arrays for plotting.
+
+    Keys (float32): ``drivers_xy`` (D, 2) driver positions, ``dir_quiver``
+    (D, 4) rows of (x, y, u, v) with the scaled arrow per driver,
+    ``pickup_xy`` (P, 2) pickups of "waiting"/"assigned" requests and
+    ``dropoff_xy`` (Q, 2) dropoffs of "picked" requests. Called by
+    ``_adapter_sync`` once per drawn state, stored in ``APP.coords``.
     """
-    vx, vy = vec
-    n = math.hypot(vx, vy)
-    if n < EPS:
-        return 0.0, 0.0
-    s = length / n
-    return vx * s, vy * s
+    drivers = APP.state.drivers
+    pending = APP.state.pending
+
+    # drivers: one pass for positions and explicit directions (NaN = fallback),
+    # with the per-driver names bound to locals
+    _float, infer, nan = float, _infer_direction_from_driver, np.nan
+    xs, ys, uxs, uys = [], [], [], []
+    add_x, add_y, add_ux, add_uy = xs.append, ys.append, uxs.append, uys.append
+    for d in drivers:
+        get = d.get
+        x, y = _float(get("x", 0.0)), _float(get("y", 0.0))
+        ux, uy = infer(d, x, y) or (nan, nan)
+        add_x(x)
+        add_y(y)
+        add_ux(ux)
+        add_uy(uy)
+    drv_x = np.asarray(xs, dtype=np.float32)
+    drv_y = np.asarray(ys, dtype=np.float32)
+    ux = np.asarray(uxs, dtype=np.float32)
+    uy = np.asarray(uys, dtype=np.float32)
+
+    # requests: one pass groups the records by status, coordinates are read per group
+    pickups, dropoffs = [], []
+    for r in pending:
+        rs = r.get("status")
+        if rs in PICKUP_STATUSES:
+            pickups.append(r)
+        elif rs in DROPOFF_STATUSES:
+            dropoffs.append(r)
+    pickup_xy = _xy(pickups, "px", "py")
+    dropoff_xy = _xy(dropoffs, "dx", "dy")
+
+    # arrows; drivers without an explicit direction aim at the nearest pending request
+    fallback = np.isnan(ux)
+    pending_xy = _xy(pending, "px", "py") if fallback.any() else np.empty((0, 2), dtype=np.float32)
+    dir_quiver = np.empty((drv_x.size, 4), dtype=np.float32)
+    # compiled loop, unless there are enough fallback pairs for the KD-tree to win
+    n_pairs = int(fallback.sum()) * len(pending_xy)
+    quiver = _quiver_numpy if cKDTree is not None and n_pairs >= KDTREE_MIN_PAIRS else _quiver_kernel
+    quiver(
+        drv_x, drv_y, ux, uy, fallback, pending_xy[:, 0], pending_xy[:, 1], ARROW_LENGTH, EPS2, dir_quiver
+    )
+    return {
+        "drivers_xy": np.column_stack((drv_x, drv_y)),
+        "dir_quiver": dir_quiver,
+        "pickup_xy": pickup_xy,
+        "dropoff_xy": dropoff_xy,
+    }
 
 
 # ---------------------------------------------------------------------------
 # Adapter API (UI <-> Backend)
 # ---------------------------------------------------------------------------
+def _adapter_sync(backend: BackendFns) -> None:
+    """Rebuild the request index and plot coordinates from the simulator state.
+
+    Does nothing unless ``APP.dirty``; call it right before ``_redraw_plot``, so
+    the records are built once per drawn frame rather than once per step.
+    """
+    if not APP.dirty:
+        return
+    APP.dirty = False
+    export = backend.get("export_records")
+    if export is not None:
+        export(APP.state.sim)
+    # reversed, so the first request with a given id wins as in a linear scan
+    APP.pending_by_id = {
+        r.get("id", r.get("rid", r.get("req_id"))): r for r in reversed(APP.state.pending)
+    }
+    APP.coords = _build_coords()  # target lookups use pending_by_id
+
+
 def _adapter_init(
     backend: BackendFns,
     drivers_path: Optional[str],
@@ -343,6 +553,7 @@ def _adapter_init(
 
     # initialize simulator state
     APP.state.sim = backend["init_state"](drivers, reqs, timeout, req_rate, GRID_WIDTH, GRID_HEIGHT)
+    APP.dirty = True
 
     # runtime mirrors
     APP.rt.horizon = int(horizon)
@@ -360,53 +571,31 @@ def _adapter_step(backend: BackendFns) -> Tuple[int, Dict]:
         backend (e.g., ``{"served": int, "expired": int, "avg_wait": float}``).
     """
     APP.state.sim, metrics = backend["simulate_step"](APP.state.sim)
+    APP.dirty = True  # the plot data is rebuilt lazily by ``_adapter_sync``
     return APP.state.sim["t"], metrics
 
 
 def _adapter_reset() -> None:
     """Reset only the simulation clock (keeps positions/state)."""
     APP.state.t = 0
+    APP.dirty = True
 
 
-def _adapter_plot_data() -> Tuple[
-    List[Tuple[float, float]],
-    List[Tuple[float, float]],
-    List[Tuple[float, float]],
-    int,
-    int,
-    List[Tuple[float, float, float, float]],
-]:
+def _adapter_plot_data() -> Tuple[np.ndarray, np.ndarray, np.ndarray, int, int, np.ndarray]:
     """Collect pre-formatted data for plotting the current simulation state.
 
     Returns
     -------
     drivers_xy, pickup_xy, dropoff_xy, served, expired, dir_quiver
-        - ``drivers_xy``: list of (x, y) driver coordinates
-        - ``pickup_xy``: list of (x, y) pickup coordinates for "waiting"/"assigned"
-        - ``dropoff_xy``: list of (x, y) dropoff coordinates for "picked"
+        - ``drivers_xy``: (D, 2) array of driver coordinates
+        - ``pickup_xy``: (P, 2) array of pickup coordinates for "waiting"/"assigned"
+        - ``dropoff_xy``: (Q, 2) array of dropoff coordinates for "picked"
         - ``served``/``expired``: integer counters
-        - ``dir_quiver``: list of (x, y, u, v) for direction arrows per driver
+        - ``dir_quiver``: (D, 4) array of (x, y, u, v) direction arrows per driver
     """
-    drivers_xy: List[Tuple[float, float]] = []
-    dir_quiver: List[Tuple[float, float, float, float]] = []
-
-    # drivers and directions
-    for d in APP.state.drivers:
-        x, y = float(d.get("x", 0.0)), float(d.get("y", 0.0))
-        drivers_xy.append((x, y))
-        ux, uy = _infer_direction_from_driver(d)
-        u, v = _normalize_and_scale((ux, uy), ARROW_LENGTH)
-        dir_quiver.append((x, y, u, v))
-
-    # requests: split into pickup vs dropoff based on status
-    pickup_xy: List[Tuple[float, float]] = []
-    dropoff_xy: List[Tuple[float, float]] = []
-    for r in APP.state.pending:
-        rs = r.get("status")
-        if rs in ("waiting", "assigned"):
-            pickup_xy.append((float(r["px"]), float(r["py"])))
-        elif rs == "picked":
-            dropoff_xy.append((float(r["dx"]), float(r["dy"])))
+    arr = APP.coords or _build_coords()  # empty before the first init
+    drivers_xy, pickup_xy, dropoff_xy = arr["drivers_xy"], arr["pickup_xy"], arr["dropoff_xy"]
+    dir_quiver = arr["dir_quiver"]
 
     served = APP.state.served
     expired = APP.state.expired
@@ -424,17 +613,23 @@ def _on_init(sender, app_data, user_data) -> None:
     """
     backend: BackendFns = user_data["backend"]
 
-    use_files = bool(dpg.get_value("use_files"))
-    drivers_path = dpg.get_value("drivers_path") if use_files else None
-    requests_path = dpg.get_value("requests_path") if use_files else None
-    n_drivers = int(dpg.get_value("n_drivers"))
-    req_rate = float(dpg.get_value("req_rate"))
-    horizon = int(dpg.get_value("horizon"))
-    timeout = int(dpg.get_value("timeout"))
+    # all inputs in one call, by int id (no tag lookups)
+    ids = APP.ui_ids or {tag: tag for tag in INIT_INPUTS}
+    values = dict(zip(INIT_INPUTS, dpg.get_values([ids[tag] for tag in INIT_INPUTS])))
+
+    use_files = bool(values["use_files"])
+    drivers_path = values["drivers_path"] if use_files else None
+    requests_path = values["requests_path"] if use_files else None
+    n_drivers = int(values["n_drivers"])
+    req_rate = float(values["req_rate"])
+    horizon = int(values["horizon"])
+    timeout = int(values["timeout"])
 
-    _adapter_init(backend, drivers_path, requests_path, n_drivers, req_rate, horizon, timeout)
-    _update_status()
-    _redraw_plot()
+    with APP.lock:
+        _adapter_init(backend, drivers_path, requests_path, n_drivers, req_rate, horizon, timeout)
+        _update_status()
+        _adapter_sync(backend)
+        _redraw_plot()
 
 
 def _on_step(sender=None, app_data=None, user_data=None) -> None:
@@ -450,10 +645,12 @@ def _on_step(sender=None, app_data=None, user_data=None) -> None:
         dpg.configure_item("run_btn", label="Run")
         return
 
-    t, metrics = _adapter_step(backend)
-    APP.rt.clock = t
-    _update_status(metrics)
-    _redraw_plot()
+    with APP.lock:
+        t, metrics = _adapter_step(backend)
+        APP.rt.clock = t
+        _update_status(metrics)
+        _adapter_sync(backend)
+        _redraw_plot()
  
 def _on_run_toggle(sender, app_data, user_data) -> None:
     if APP.rt.running:
@@ -467,15 +664,18 @@ def _on_reset(sender, app_data, user_data) -> None:
     """Reset the simulation clock and refresh the UI."""
     APP.rt.running = False
     dpg.configure_item("run_btn", label="Run")
-    _adapter_reset()
-    APP.rt.clock = 0
-    _update_status()
-    _redraw_plot()
+    with APP.lock:
+        _adapter_reset()
+        APP.rt.clock = 0
+        _update_status()
+        _adapter_sync(user_data["backend"])
+        _redraw_plot()
 
 
 def _on_speed_change(sender, app_data, user_data) -> None:
     """Update the runtime step delay (ms per step) from the slider value."""
     APP.rt.speed = int(dpg.get_value("speed"))
+    APP.rt.period_s = APP.rt.speed * 1e-3
 
 
 def _update_status(metrics: Optional[Dict] = None) -> None:
@@ -483,36 +683,96 @@ def _update_status(metrics: Optional[Dict] = None) -> None:
     served = 0 if metrics is None else int(metrics.get("served", 0))
     expired = 0 if metrics is None else int(metrics.get("expired", 0))
     avg_wait = 0.0 if metrics is None else float(metrics.get("avg_wait", 0.0))
+
+    # skip formatting and the UI call when the line would not change
+    key = (APP.rt.clock, served, expired, round(avg_wait, 2))
+    if key == APP.rt.status_key:
+        return
+    APP.rt.status_key = key
+
     label = f"t = {APP.rt.clock} | served = {served} | expired = {expired} | avg_wait={avg_wait:.2f}"
     dpg.set_value("status_text", label)
 
 
+def _ensure_arrows(n: int) -> List[int]:
+    """Grow the arrow pool to at least ``n`` (hidden) line items and return it."""
+    pool = APP.rt.arrow_pool
+    while len(pool) < n:
+        pool.append(dpg.draw_line((0, 0), (0, 0), color=ARROW_COLOR, thickness=0.5, parent="dir_draw", show=False))
+    return pool
+
+
 def _redraw_plot() -> None:
     """Refresh scatter series and direction arrows from current simulation state."""
     drivers_xy, pickup_xy, dropoff_xy, served, expired, dir_quiver = _adapter_plot_data()
 
-    dx = [x for x, _ in drivers_xy]
-    dy = [y for _, y in drivers_xy]
-    px = [x for x, _ in pickup_xy]
-    py = [y for _, y in pickup_xy]
-    gx = [x for x, _ in dropoff_xy]
-    gy = [y for _, y in dropoff_xy]
+    # column views, converted to lists at the DearPyGui boundary
+    dpg.configure_item("drv_series", x=drivers_xy[:, 0].tolist(), y=drivers_xy[:, 1].tolist())
+    dpg.configure_item("pickup_series", x=pickup_xy[:, 0].tolist(), y=pickup_xy[:, 1].tolist())
+    dpg.configure_item("dropoff_series", x=dropoff_xy[:, 0].tolist(), y=dropoff_xy[:, 1].tolist())
 
-    dpg.configure_item("drv_series", x=dx, y=dy)
-    dpg.configure_item("pickup_series", x=px, y=py)
-    dpg.configure_item("dropoff_series", x=gx, y=gy)
-
-    # redraw arrows
-    dpg.delete_item("dir_draw", children_only=True)
-    for (x, y, u, v) in dir_quiver:
-        dpg.draw_line((x, y), (x + u, y + v), color=(128, 128, 128, 160), thickness=0.5, parent="dir_draw")
+    # move the pooled arrow items (by int id) instead of recreating them
+    n = len(dir_quiver)
+    pool = _ensure_arrows(n)
+    for item, (x, y, u, v) in zip(pool, dir_quiver.tolist()):
+        dpg.configure_item(item, p1=(x, y), p2=(x + u, y + v), show=True)
+    for item in pool[n:APP.rt.arrows_shown]:
+        dpg.configure_item(item, show=False)
+    APP.rt.arrows_shown = n
 
     dpg.set_value(
         "legend_text",
-        f"drivers: {len(dx)} | pickups: {len(px)} | dropoffs: {len(gx)} | served={served} | expired={expired}",
+        f"drivers: {len(drivers_xy)} | pickups: {len(pickup_xy)} | dropoffs: {len(dropoff_xy)}"
+        f" | served={served} | expired={expired}",
     )
 
 
+# ---------------------------------------------------------------------------
+# Simulation worker
+# ---------------------------------------------------------------------------
+def _sim_worker(
+    backend: BackendFns,
+    stop: threading.Event,
+    updates: queue.Queue,
+    on_update: Optional[Callable[[], None]] = None,
+) -> None:
+    """Advance the simulation at the chosen speed while ``APP.rt.running``.
+
+    Runs on a background thread so a slow backend never stalls rendering.
+    After every step the latest metrics are published to ``updates`` (size 1,
+    older unread ones are dropped) and ``on_update()`` is called, e.g. to
+    schedule a redraw.
+    """
+    last = time.monotonic()
+    while not stop.is_set():
+        if not APP.rt.run_event.wait(timeout=0.1) or APP.rt.clock >= APP.rt.horizon:
+            stop.wait(0.05)
+            last = time.monotonic()
+            continue
+
+        period = APP.rt.period_s
+        delay = last + period - time.monotonic()
+        if delay > 0 and stop.wait(delay):
+            break
+
+        with APP.lock:
+            if not APP.rt.running or APP.rt.clock >= APP.rt.horizon:
+                continue
+            APP.rt.clock, metrics = _adapter_step(backend)
+
+        try:
+            updates.get_nowait()  # drop the stale update, only the latest matters
+        except queue.Empty:
+            pass
+        updates.put_nowait(metrics)
+        if on_update is not None:
+            on_update()
+
+        last += period
+        if time.monotonic() - last >= period:
+            last = time.monotonic()  # too far behind: drop the backlog instead of catching up
+
+
 # ---------------------------------------------------------------------------
 # Application entry point
 # ---------------------------------------------------------------------------
@@ -602,24 +862,44 @@ def run_app(backend: Optional[BackendFns] = None) -> None:
 
                 # draw arrows on top of the plot (must be parented to the plot)
                 dpg.add_draw_layer(parent="plot", tag="dir_draw")
+                APP.rt.arrow_pool = []
+                APP.rt.arrows_shown = 0
+                _ensure_arrows(ARROW_PREALLOC)
+
+    APP.ui_ids = {tag: dpg.get_alias_id(tag) for tag in INIT_INPUTS}
 
     dpg.setup_dearpygui()
     dpg.show_viewport()
-    last = time.perf_counter()
-    while dpg.is_dearpygui_running():
-    # run one step at the chosen speed only if running
-        if APP.rt.running and APP.rt.clock < APP.rt.horizon:
-            now = time.perf_counter()
-            if (now - last) >= (APP.rt.speed / 1000.0):
-               
-                APP.state.sim, metrics = backend["simulate_step"](APP.state.sim)
-                APP.rt.clock = APP.state.sim["t"]
-                _update_status(metrics)
-                _redraw_plot()
-                last = now
-        dpg.render_dearpygui_frame()
-
-dpg.destroy_context()   
+    updates: queue.Queue = queue.Queue(maxsize=1)
+
+    def redraw_latest() -> None:
+        # frame callback, kept armed for the next frame from within itself (the
+        # worker never picks frame numbers, so no update can fall between frames);
+        # redraws once from the newest state the worker produced, if any
+        dpg.set_frame_callback(dpg.get_frame_count() + 1, redraw_latest)
+        try:
+            metrics = updates.get_nowait()
+        except queue.Empty:
+            return
+        with APP.lock:
+            _update_status(metrics)
+            _adapter_sync(backend)
+            _redraw_plot()
+
+    dpg.set_frame_callback(1, redraw_latest)
+
+    stop = threading.Event()
+    worker = threading.Thread(
+        target=_sim_worker, args=(backend, stop, updates), name="sim-worker", daemon=True
+    )
+    worker.start()
+    try:
+        # DearPyGui owns the render loop; nothing runs on this thread per frame
+        dpg.start_dearpygui()
+    finally:
+        stop.set()
+        worker.join()
+        dpg.destroy_context()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+"""
+Ahead-of-time build of the simulation kernel.
+
+Run once from the phase1_project folder:
+
+    python -m phase1._sim_aot
+
+This writes the ``phase1/sim_aot`` extension module next to this file.
+``sim_mod`` imports it when present, so the first ``simulate_step`` does
+not pay any JIT compile time; without it ``sim_mod`` compiles the same
+kernel with ``@njit`` at import. Rebuild after changing the kernel, or
+delete the extension module.
+"""
+import os
+
+from numba.pycc import CC
+
+from phase1.sim_mod import STEP_SIGNATURE, step_kernel
+
+cc = CC("sim_aot")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export("step_kernel", STEP_SIGNATURE)(step_kernel)
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -1,122 +1,207 @@
+import warnings
+from dataclasses import dataclass
 
-def load_drivers(path):
+import numpy as np
+
+try:  # optional: Polars' multithreaded CSV reader, used for large files
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Request status codes (int8 in the request arrays, plain int in records).
+# WAITING/ASSIGNED come first so "not yet picked up" is simply status <= ASSIGNED.
+STATUS_WAITING = 0
+STATUS_ASSIGNED = 1
+STATUS_EXPIRED = 2
+STATUS_PICKED = 3
+STATUS_DELIVERED = 4
+STATUS_NAMES = ("waiting", "assigned", "expired", "picked", "delivered")  # index = code
+
+NO_ID = -1  # "no driver" / "no request" marker in the int32 link arrays
+
+POLARS_MIN_BYTES = 1 << 20  # smaller files parse faster with np.loadtxt
+
+
+class _Record:
     """
-    Load driver positions from a CSV file (no header, only x,y values).
-    Skips lines starting with '#'.
-    Returns a list of driver dictionaries in the format required by the GUI.
+    Read access by key (``r["x"]``, ``r.get("x")``, ``"x" in r``) so code
+    written for the old driver/request dictionaries keeps working.
     """
-    import os
-    if not os.path.isabs(path):
-        path = os.path.join(os.path.dirname(__file__), path)
-    
-    drivers = []
-    with open(path, "r") as f:    # Python åbner filen 
-        for line in f:            # Indlæser linje for linje
-            line = line.strip()
-            # skipper tommer linjer eller kommentarer
-            if not line or line.startswith("#"): #her konverteres dataen til tal
-                continue
-
-            parts = line.split(",")
-
-            if len(parts) < 2:
-                continue
-
-            # konverterer værdier fra tekst til flydende (floats) tal
-            x, y = map(float, parts[:2])
-
-            # laver en dictionary for chaufføren
-            driver = {
-                "id": len(drivers),
-                "x": x,
-                "y": y,
-                "vx": 0.0, "vy": 0.0,   # hastighed - kan ændres senere
-                "tx": None, "ty": None, # pick-up/delivery - kan laves senere
-                "target_id": None       # tildelt ordre - senere
-            }
-            drivers.append(driver)
-
-    return drivers
-
-def load_requests(path):
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __contains__(self, key):
+        return key in self.__dataclass_fields__
+
+
+@dataclass(slots=True)
+class Driver(_Record):
+    """One driver, as returned by load_drivers(legacy=True) and generate_drivers."""
+    id: int
+    x: float
+    y: float
+    vx: float = 0.0                 # hastighed - kan ændres senere
+    vy: float = 0.0
+    speed: float = 1.0
+    tx: float | None = None         # pick-up/delivery target
+    ty: float | None = None
+    target_id: int | None = None    # tildelt ordre
+
+
+@dataclass(slots=True)
+class Request(_Record):
+    """One request, as returned by load_requests(legacy=True) and generate_requests."""
+    id: int
+    px: float                       # pickup-koordinater
+    py: float
+    dx: float                       # dropoff-koordinater
+    dy: float
+    t: int                          # tidspunkt ordren blev oprettet
+    t_wait: int = 0                 # ventetid
+    status: int = STATUS_WAITING    # startstatus = "venter på tildeling"
+    driver_id: int | None = None    # ingen chauffør endnu
+
+
+def _read_columns(path, ncols):
     """
-    Reads order data (requests) from a CSV file.
-    The format is: time, pickup_x, pickup_y, delivery_x, delivery_y
-    Comment lines (starting with '#') are skipped.
-    Returns a list of request dictionaries in the project's required format.
+    Parse the first ``ncols`` columns of a numeric CSV file into a 2-D float array.
+    Lines starting with '#' are skipped, relative paths are resolved against phase1/.
     """
     import os
-    # Resolve relative paths against this module's folder (phase1/)
     if not os.path.isabs(path):
         path = os.path.join(os.path.dirname(__file__), path)
 
-    requests = []  # alle ordres gemmes her
+    if pl is not None and os.path.getsize(path) >= POLARS_MIN_BYTES:
+        arr = _read_columns_polars(path, ncols)
+        if arr is not None:
+            return arr
+
+    cols = tuple(range(ncols))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)  # empty file / skipped short lines
+        try:
+            arr = np.loadtxt(path, delimiter=",", comments="#", usecols=cols, ndmin=2)
+        except ValueError:
+            # a line with too few values: read the file in one go, drop such
+            # lines and let loadtxt parse the rest
+            with open(path, "r") as f:
+                lines = [
+                    line for line in f.read().splitlines()
+                    if line.partition("#")[0].count(",") >= ncols - 1
+                ]
+            arr = np.loadtxt(lines, delimiter=",", comments="#", usecols=cols, ndmin=2)
+
+    return arr if arr.size else np.empty((0, ncols))
+
+
+def _read_columns_polars(path, ncols):
+    """
+    _read_columns with Polars, for files of exactly ``ncols`` float columns
+    (short lines are dropped). Returns None for anything else, such as
+    extra columns or stray text, so the caller falls back to NumPy.
+    """
+    names = [f"c{i}" for i in range(ncols)]
+    try:
+        df = pl.read_csv(
+            path, has_header=False, comment_prefix="#", new_columns=names,
+            schema_overrides={name: pl.Float64 for name in names},
+            truncate_ragged_lines=True,
+        )
+    except pl.exceptions.PolarsError:
+        return None
+    arr = df.drop_nulls().to_numpy()
+    return arr if arr.size else np.empty((0, ncols))
 
-    with open(path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue  # spring kommentarer/tomme linjer over
 
-            parts = line.split(",")
-            if len(parts) < 5:
-                continue  # linjer uden 5 værdier springes over
+def load_drivers(path, legacy=False):
+    """
+    Load driver positions from a CSV file (no header, only x,y values).
+    Skips lines starting with '#' and lines with fewer than 2 values.
 
-            # konverterer værdierne til rigtige datatyper
-            t, px, py, dx, dy = parts[:5]
-            t, px, py, dx, dy = int(float(t)), float(px), float(py), float(dx), float(dy)
+    Returns a dict of NumPy arrays (one per field, index = driver id), or
+    with ``legacy=True`` a list of ``Driver`` records for the GUI.
+    """
+    arr = _read_columns(path, 2)
+    n = len(arr)
+    x, y = arr[:, 0], arr[:, 1]
 
-            # dictionary for reqs
-            req = {
-                "id": len(requests),   # id = rækkefølge i filen
-                "px": px, "py": py,    # pickup-koordinater
-                "dx": dx, "dy": dy,    # dropoff-koordinater
-                "t": t,                # tidspunkt ordren blev oprettet
-                "t_wait": 0,           # ventetid 
-                "status": "waiting",   # startstatus = "venter på tildeling"
-                "driver_id": None      # ingen chauffør endnu
-            }
+    if legacy:
+        return [Driver(i, xi, yi) for i, (xi, yi) in enumerate(zip(x.tolist(), y.tolist()))]
 
-            requests.append(req)
+    return {
+        "x": x,
+        "y": y,
+        "tx": x.copy(),                          # idle: target = own position
+        "ty": y.copy(),
+        "target_id": np.full(n, NO_ID, np.int32),
+    }
 
-    return requests
+def load_requests(path, legacy=False):
+    """
+    Reads order data (requests) from a CSV file.
+    The format is: time, pickup_x, pickup_y, delivery_x, delivery_y
+    Comment lines (starting with '#') and lines with fewer than 5 values are skipped.
 
-import random
+    Returns a dict of NumPy arrays (one per field, index = request id), or
+    with ``legacy=True`` a list of ``Request`` records (id = position in the file).
+    """
+    arr = _read_columns(path, 5)
+    n = len(arr)
+    t = arr[:, 0].astype(np.int64)  # tidspunkt ordren blev oprettet
 
-def generate_drivers(n: int, width: float, height: float) -> list[dict]:
+    if legacy:
+        return [
+            Request(i, px, py, dx, dy, ti)
+            for i, (ti, px, py, dx, dy) in enumerate(zip(
+                t.tolist(), *(arr[:, k].tolist() for k in range(1, 5))
+            ))
+        ]
+
+    return {
+        "t": t,
+        "px": arr[:, 1], "py": arr[:, 2],        # pickup-koordinater
+        "dx": arr[:, 3], "dy": arr[:, 4],        # dropoff-koordinater
+        "t_wait": np.zeros(n, np.int32),
+        "status": np.full(n, STATUS_WAITING, np.int8),
+        "driver_id": np.full(n, NO_ID, np.int32),  # ingen chauffør endnu
+    }
+
+def generate_drivers(n: int, width: float, height: float, legacy: bool = False,
+                     seed: int | None = None) -> dict[str, np.ndarray] | list[Driver]:
     """
     Generate n random drivers uniformly distributed within the given grid dimensions.
-    
+    All positions come from a single ``rng.uniform`` call.
+
     Returns
     -------
-    list[dict]
-        A list of driver dictionaries initialized with random positions and default parameters.
-    """
-
-    drivers = []  # Liste som gemmer alle de genererede drivers.
-
-    for i in range(n):
-        # Gemmer x- og y-koordinat tilfældigt i vores ønskede grid
-        x = random.uniform(0, width)
-        y = random.uniform(0, height)
-
-        # Driver dictionaries
-        driver = {
-            "id": i,          # Unique driver identifier
-            "x": x,           # Random x position
-            "y": y,           # Random y position
-            "vx": 0.0,        # Initial velocity (stationary)
-            "vy": 0.0,        # Initial velocity (stationary)
-            "speed": 1.0,     # Default constant speed
-            "tx": x,          # Initial target position same as current (idle)
-            "ty": y,
-            "target_id": None # No assigned request yet
-        }
-
-        # Tilføjer drivers til vores liste
-        drivers.append(driver)
-
-    return drivers
+    dict[str, np.ndarray] | list[Driver]
+        Driver arrays in the same layout as ``load_drivers``, or with
+        ``legacy=True`` a list of driver records. Every driver starts idle,
+        with its target at its own position.
+    """
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0.0, (width, height), size=(n, 2))  # kolonner: x, y
+    x, y = xy[:, 0], xy[:, 1]
+
+    if legacy:
+        return [Driver(i, xi, yi, tx=xi, ty=yi) for i, (xi, yi) in enumerate(zip(x.tolist(), y.tolist()))]
+
+    return {
+        "x": x,
+        "y": y,
+        "tx": x.copy(),
+        "ty": y.copy(),
+        "target_id": np.full(n, NO_ID, np.int32),
+    }
+
 import random
 
 def generate_requests(start_t, out_list, req_rate, width, height):
@@ -132,16 +217,42 @@ def generate_requests(start_t, out_list, req_rate, width, height):
     """
     if random.random() < req_rate: # Kører kun hvis random.random (tilfældigt tal mellem 0.0 - 1.0) er mindre end req_rate.
         rid = len(out_list)  
-        request = {
-            "id": rid,
-            "px": random.uniform(0, width),
-            "py": random.uniform(0, height),
-            "dx": random.uniform(0, width),
-            "dy": random.uniform(0, height),
-            "t": start_t,
-            "t_wait": 0,
-            "status": "waiting",
-            "driver_id": None
-        }
+        request = Request(
+            rid,
+            px=random.uniform(0, width),
+            py=random.uniform(0, height),
+            dx=random.uniform(0, width),
+            dy=random.uniform(0, height),
+            t=start_t,
+        )
         out_list.append(request) # Tilføjer requesten til out_list.
 
+
+def generate_request_schedule(start_t, n_ticks, req_rate, width, height, rng=None):
+    """
+    Pre-sample the arrivals of ``n_ticks`` time steps starting at ``start_t``:
+    a Poisson(req_rate) number of requests per step, with uniform pickup and
+    dropoff points. Uses one RNG call for the counts and one for the points.
+
+    Returns
+    -------
+    (offsets, requests)
+        ``requests`` holds the arrays in the layout of ``load_requests``; the
+        requests of step ``start_t + k`` are rows ``offsets[k]:offsets[k + 1]``.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    counts = rng.poisson(req_rate, n_ticks)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    m = int(offsets[-1])
+    pts = rng.uniform(0.0, (width, height, width, height), size=(m, 4))  # px, py, dx, dy
+
+    return offsets, {
+        "t": np.repeat(np.arange(start_t, start_t + n_ticks, dtype=np.int64), counts),
+        "px": pts[:, 0], "py": pts[:, 1],
+        "dx": pts[:, 2], "dy": pts[:, 3],
+        "t_wait": np.zeros(m, np.int32),
+        "status": np.full(m, STATUS_WAITING, np.int8),
+        "driver_id": np.full(m, NO_ID, np.int32),
+    }
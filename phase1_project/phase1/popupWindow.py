@@ -1,7 +1,10 @@
 import matplotlib.pyplot as plt
+import numpy as np
 from .io_mod import load_drivers, load_requests
 from .sim_mod import init_state, simulate_step
 
+N_STEPS = 600
+
 def popupWindow(): 
     drivers = load_drivers("data/drivers.csv")
     requests = load_requests("data/requests.csv")
@@ -15,15 +18,16 @@ def popupWindow():
         height=40
     )
 
-    served_hist = []
-    expired_hist = []
-    avg_hist = []
+    # one slot per step, filled in place
+    served_hist = np.empty(N_STEPS, dtype=np.float32)
+    expired_hist = np.empty(N_STEPS, dtype=np.float32)
+    avg_hist = np.empty(N_STEPS, dtype=np.float32)
 
-    for _ in range(600):
+    for i in range(N_STEPS):
         state, metrics = simulate_step(state)
-        served_hist.append(metrics["served"])
-        expired_hist.append(metrics["expired"])
-        avg_hist.append(metrics["avg_wait"])
+        served_hist[i] = metrics["served"]
+        expired_hist[i] = metrics["expired"]
+        avg_hist[i] = metrics["avg_wait"]
 
 
     # popup shows after ending of simulation
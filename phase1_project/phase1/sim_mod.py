@@ -1,17 +1,56 @@
-import math
-
-from phase1.io_mod import generate_requests
-
-def init_state(drivers, requests, timeout, rate, width, height):
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels then run as plain Python (slow)
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+from phase1.io_mod import (
+    NO_ID,
+    Driver,
+    Request,
+    STATUS_ASSIGNED,
+    STATUS_DELIVERED,
+    STATUS_EXPIRED,
+    STATUS_NAMES,
+    STATUS_PICKED,
+    STATUS_WAITING,
+    generate_request_schedule,
+)
+
+# status names still accepted from hand-written request dictionaries/records
+_STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+SCHEDULE_TICKS = 1024  # time steps of request arrivals sampled at once
+# Coordinates are float32: the grid is small and the arrival tolerance is 0.5,
+# so 7 significant digits are plenty and the arrays stream twice as fast.
+COORD = np.float32
+DRIVER_SPEED = COORD(3.0)  # grid units a driver moves per tick
+ARRIVAL_TOL = COORD(0.5)   # distance at which a pickup/dropoff counts as reached
+ARRIVAL_TOL2 = ARRIVAL_TOL * ARRIVAL_TOL
+
+
+def init_state(drivers, requests, timeout, rate, width, height, seed=None):
     """
     Initializes the full simulation state as described in the project specification (section 4.2.2).
 
+    Drivers and requests are copied once into a Structure-of-Arrays layout
+    (one NumPy array per field, indexed by driver/request id). Both the
+    array form returned by ``load_*`` and lists of records or dictionaries
+    are accepted. The lists of
+    records in ``state["drivers"]`` / ``state["pending"]`` are only a
+    read-only view for the GUI; they start empty and are rebuilt on demand
+    by ``export_records``.
+
     Parameters
     ----------
-    drivers : list[dict]
-        List of driver dictionaries (from load_drivers or generate_drivers)
-    requests : list[dict]
-        List of request dictionaries (from load_requests or generate_requests)
+    drivers : dict[str, np.ndarray] | list[Driver]
+        Driver arrays or records (from load_drivers or generate_drivers)
+    requests : dict[str, np.ndarray] | list[Request]
+        Request arrays or records (from load_requests or generate_requests)
     timeout : int
         Maximum waiting time before a request expires
     rate : float
@@ -20,26 +59,76 @@ def init_state(drivers, requests, timeout, rate, width, height):
         Width of the simulation grid
     height : int
         Height of the simulation grid
+    seed : int | None
+        Seed for the random request arrivals (None = not reproducible)
 
     Returns
     -------
     dict
         The complete state dictionary
     """
-    return {
+    if not isinstance(drivers, dict):
+        drivers = _driver_columns(drivers)
+
+    drv_x = np.array(drivers["x"], dtype=COORD)
+    drv_y = np.array(drivers["y"], dtype=COORD)
+    # idle drivers "target" their own position
+    drv_tx = np.array(drivers.get("tx", drv_x), dtype=COORD)
+    drv_ty = np.array(drivers.get("ty", drv_y), dtype=COORD)
+    n_drv = len(drv_x)
+    drv_target = np.full(n_drv, NO_ID, dtype=np.int32)
+
+    state = {
         "t": 0,                   # start time
-        "drivers": drivers,       # chauffør-liste
-        "pending": requests,      # active orders
-        "future": [],             
+        "drivers": [],            # GUI view of the driver arrays
+        "pending": [],            # GUI view of the active requests
+        "future": {},             # pre-sampled arrivals (see _schedule_requests)
+        "future_offsets": np.zeros(1, dtype=np.int64),
+        "future_t0": 1,           # time step of future_offsets[0]
+        "rng": np.random.default_rng(seed),
         "served": 0,              # count of served orders
         "expired": 0,             # count of expired orders
         "timeout": timeout,       # max. wait time
-        "served_waits": [],       # wait time for served orders
-        "req_rate": rate,         # orders pr. min. 
+        "served_waits": np.empty(64, dtype=np.int32),  # wait time for served orders, grown on demand
+        "n_waits": 0,             # entries of served_waits in use
+        "req_rate": rate,         # orders pr. min.
         "width": width,
-        "height": height
+        "height": height,
+
+        # driver arrays (index = driver id)
+        "drv_x": drv_x,
+        "drv_y": drv_y,
+        "drv_tx": drv_tx,
+        "drv_ty": drv_ty,
+        "drv_target": drv_target,  # request index or NO_ID
+        "free": np.empty(n_drv, dtype=np.int32),  # stack of idle drivers, n_free in use
+        "n_free": 0,
+
+        # request arrays (index = request id); grown on demand, n_req in use
+        "n_req": 0,
+        "req_lo": 0,  # every request below this index is expired or delivered
+        "req_px": np.empty(0, dtype=COORD),
+        "req_py": np.empty(0, dtype=COORD),
+        "req_dx": np.empty(0, dtype=COORD),
+        "req_dy": np.empty(0, dtype=COORD),
+        "req_t": np.empty(0, dtype=np.int64),
+        "req_status": np.empty(0, dtype=np.int8),
+        "req_driver": np.empty(0, dtype=np.int32),  # driver index or NO_ID
     }
 
+    _append_requests(state, requests)
+
+    # a request handed in already assigned keeps its driver
+    req_driver = state["req_driver"]
+    for rid in np.flatnonzero(req_driver[:state["n_req"]] != NO_ID):
+        drv_target[req_driver[rid]] = rid
+
+    idle = np.flatnonzero(drv_target == NO_ID)
+    state["free"][:len(idle)] = idle
+    state["n_free"] = len(idle)
+
+    return state
+
 
 def simulate_step(state):
     """
@@ -50,147 +139,315 @@ def simulate_step(state):
     # 1) Advance time
     # ---------------------------------------
     state["t"] += 1  # increase simulation timestamp by 1 minute
+    t = state["t"]
 
     # ---------------------------------------
-    # 2) Generate new requests
+    # 2) Release this step's requests from the pre-sampled schedule
     # ---------------------------------------
-    generate_requests(
-        state["t"],          # current time
-        state["pending"],    # append new request to pending list
-        state["req_rate"],   # probability of generating a request
-        state["width"],      # grid width
-        state["height"]      # grid height
-    )
+    k = t - state["future_t0"]
+    if k < 0 or k >= len(state["future_offsets"]) - 1:  # exhausted, or t moved back (reset)
+        _schedule_requests(state, t)
+        k = 0
 
-    # ---------------------------------------
-    # 3) Expire old requests
-    # ---------------------------------------
-    for req in state["pending"]:
-        if req["status"] in ("waiting", "assigned"):  # only requests not yet delivered
-            if state["t"] - req["t"] > state["timeout"]:  # too much wait time?
-                req["status"] = "expired"
-                state["expired"] += 1
-
-                # If the expired request had a driver assigned…
-                if req["driver_id"] is not None:
-                    d = state["drivers"][req["driver_id"]]
-                    d["target_id"] = None  # free that driver again
+    start, end = state["future_offsets"][k], state["future_offsets"][k + 1]
+    if end > start:
+        _append_requests(state, {key: arr[start:end] for key, arr in state["future"].items()})
 
     # ---------------------------------------
-    # 4) Assign first waiting request to first free driver
+    # 3)-5) Expire, assign, move (compiled kernel)
     # ---------------------------------------
-    for driver in state["drivers"]:
-        if driver["target_id"] is None:  # free driver?
-            for req in state["pending"]:
-                if req["status"] == "waiting":  # unassigned request found
-                    req["status"] = "assigned"
-                    req["driver_id"] = driver["id"]  # link request -> driver
-                    driver["target_id"] = req["id"]  # link driver -> request
-
-                    # driver moves toward pickup location
-                    driver["tx"], driver["ty"] = req["px"], req["py"]
-                    break  # stop after assigning one request
+    n = state["n_req"]
+
+    # room for one delivery per driver this tick
+    n_waits = state["n_waits"]
+    waits = state["served_waits"]
+    if n_waits + len(state["drv_x"]) > len(waits):
+        grown = np.empty(max(2 * len(waits), n_waits + len(state["drv_x"])), dtype=np.int32)
+        grown[:n_waits] = waits[:n_waits]
+        state["served_waits"] = waits = grown
+
+    served, expired, state["n_waits"], state["req_lo"], state["n_free"] = _step_kernel(
+        t,
+        state["drv_x"], state["drv_y"], state["drv_tx"], state["drv_ty"], state["drv_target"],
+        state["free"], state["n_free"],
+        state["req_px"][:n], state["req_py"][:n], state["req_dx"][:n], state["req_dy"][:n],
+        state["req_t"][:n], state["req_status"][:n], state["req_driver"][:n],
+        state["req_lo"],
+        state["timeout"],
+        waits, n_waits,
+    )
+    state["served"] += served
+    state["expired"] += expired
 
     # ---------------------------------------
-    # 5) Move drivers and handle pickup/delivery
+    # 6) Metrics
     # ---------------------------------------
-    delivered_ids = []   # will store IDs of delivered requests
-
-    for driver in state["drivers"]:
+    metrics = {
+        "served": state["served"],
+        "expired": state["expired"],
+        "avg_wait": (
+            float(state["served_waits"][:state["n_waits"]].mean())
+            if state["n_waits"] else 0
+        )
+    }
 
-        if driver["target_id"] is None:  # driver is idle
-            continue
+    return state, metrics
 
-        # Find the request this driver is handling
-        req = next((r for r in state["pending"] if r["id"] == driver["target_id"]), None)
 
-        if req is None:  # request no longer exists (rare safety case)
-            driver["target_id"] = None
-            continue
+# ======================================================
+# Array bookkeeping
+# ======================================================
 
-        # Determine movement target (pickup or dropoff)
-        if req["status"] == "assigned":
-            target = (req["px"], req["py"])  # pickup location
-        else:
-            target = (req["dx"], req["dy"])  # delivery location
+_REQ_FIELDS = ("req_px", "req_py", "req_dx", "req_dy", "req_t", "req_status", "req_driver")
 
-        # Move driver one step toward target
-        move_driver(driver, target)
 
-        # ---------------------
-        # Pickup event
-        # ---------------------
-        if req["status"] == "assigned" and close_enough(driver, target):
-            req["status"] = "picked"             # pickup done
-            driver["tx"], driver["ty"] = req["dx"], req["dy"]  # move to delivery next
+def _schedule_requests(state, t):
+    """
+    Samples the request arrivals for SCHEDULE_TICKS steps starting at ``t``
+    (Poisson with mean ``req_rate`` per step) into ``state["future"]``.
+    """
+    state["future_offsets"], state["future"] = generate_request_schedule(
+        t, SCHEDULE_TICKS, state["req_rate"], state["width"], state["height"], state["rng"]
+    )
+    state["future_t0"] = t
 
-        # ---------------------
-        # Delivery event
-        # ---------------------
-        elif req["status"] == "picked" and close_enough(driver, target):
-            req["status"] = "delivered"      # mark delivered
-            state["served"] += 1             # update counter
-            state["served_waits"].append(state["t"] - req["t"])  # record wait time
-            delivered_ids.append(req["id"])  # schedule for removal
 
-            driver["target_id"] = None                     # driver becomes free
-            driver["tx"], driver["ty"] = driver["x"], driver["y"]  # idle target = current pos
-            req["driver_id"] = None                        # detach driver from request
+def _driver_columns(drivers):
+    """
+    Converts a list of driver records (or dictionaries) to a dict of columns.
+    """
+    return {
+        "x": [d["x"] for d in drivers],
+        "y": [d["y"] for d in drivers],
+        "tx": [d["x"] if d.get("tx") is None else d["tx"] for d in drivers],
+        "ty": [d["y"] if d.get("ty") is None else d["ty"] for d in drivers],
+    }
 
-    # ---------------------------------------
-    # 6) Remove delivered requests from list
-    # ---------------------------------------
-    if delivered_ids:
-        state["pending"] = [
-            r for r in state["pending"] if r["id"] not in delivered_ids
-        ]
 
-    # ---------------------------------------
-    # 7) Metrics
-    # ---------------------------------------
-    metrics = {
-        "served": state["served"],
-        "expired": state["expired"],
-        "avg_wait": (
-            sum(state["served_waits"]) / len(state["served_waits"])
-            if state["served_waits"] else 0
-        )
+def _request_columns(requests):
+    """
+    Converts a list of request records (or dictionaries) to a dict of columns with
+    integer status codes and NO_ID for "no driver".
+    """
+    status = [r.get("status", STATUS_WAITING) for r in requests]
+    return {
+        "px": [r["px"] for r in requests],
+        "py": [r["py"] for r in requests],
+        "dx": [r["dx"] for r in requests],
+        "dy": [r["dy"] for r in requests],
+        "t": [r["t"] for r in requests],
+        "status": [_STATUS_CODES.get(s, STATUS_WAITING) if isinstance(s, str) else s for s in status],
+        "driver_id": [NO_ID if r.get("driver_id") is None else r["driver_id"] for r in requests],
     }
 
-    return state, metrics
+
+def _append_requests(state, requests):
+    """
+    Copies requests (arrays or a list of records) into the request
+    arrays, growing them geometrically when full. The request id becomes
+    its array index.
+    """
+    if not isinstance(requests, dict):
+        requests = _request_columns(requests)
+
+    n = state["n_req"]
+    needed = n + len(requests["t"])
+    if needed > len(state["req_t"]):
+        capacity = max(needed, 2 * len(state["req_t"]), 64)
+        for key in _REQ_FIELDS:
+            grown = np.empty(capacity, dtype=state[key].dtype)
+            grown[:n] = state[key][:n]
+            state[key] = grown
+
+    state["req_px"][n:needed] = requests["px"]
+    state["req_py"][n:needed] = requests["py"]
+    state["req_dx"][n:needed] = requests["dx"]
+    state["req_dy"][n:needed] = requests["dy"]
+    state["req_t"][n:needed] = requests["t"]
+    state["req_status"][n:needed] = requests["status"]
+    state["req_driver"][n:needed] = requests["driver_id"]
+
+    state["n_req"] = needed
+
+
+def export_records(state):
+    """
+    Rebuilds ``state["drivers"]`` and ``state["pending"]`` (active requests
+    only) as lists of ``Driver``/``Request`` records for the GUI.
+
+    Not called by ``simulate_step``: building the records costs far more
+    than a step, so callers that need them (the GUI, once per drawn state)
+    call this themselves.
+    """
+    targets = state["drv_target"].tolist()
+    state["drivers"] = [
+        Driver(i, x, y, tx=tx, ty=ty, target_id=None if target == NO_ID else target)
+        for i, (x, y, tx, ty, target) in enumerate(zip(
+            state["drv_x"].tolist(), state["drv_y"].tolist(),
+            state["drv_tx"].tolist(), state["drv_ty"].tolist(), targets,
+        ))
+    ]
+
+    lo, n = state["req_lo"], state["n_req"]
+    status = state["req_status"][:n]
+    active = lo + np.flatnonzero((status[lo:] <= STATUS_ASSIGNED) | (status[lo:] == STATUS_PICKED))
+    state["pending"] = [
+        Request(rid, px, py, dx, dy, t, state["t"] - t, code, None if driver == NO_ID else driver)
+        for rid, px, py, dx, dy, t, code, driver in zip(
+            active.tolist(),
+            state["req_px"][active].tolist(), state["req_py"][active].tolist(),
+            state["req_dx"][active].tolist(), state["req_dy"][active].tolist(),
+            state["req_t"][active].tolist(), status[active].tolist(),
+            state["req_driver"][active].tolist(),
+        )
+    ]
 
 
 # ======================================================
 # Helpers — with inline comments
+# (inline="always": numba pastes them into the kernel, no call boundary)
 # ======================================================
 
-def move_driver(driver, target, speed=3.0):
-    # target coordinates
-    tx, ty = target
-    x, y = driver["x"], driver["y"]
+@njit(inline="always")
+def move_drivers(drv_x, drv_y, drv_tx, drv_ty, speed=DRIVER_SPEED):
+    # direction vectors toward each driver's target (idle: own position)
+    dx = drv_tx - drv_x
+    dy = drv_ty - drv_y
 
-    # compute direction vector
-    dx = tx - x
-    dy = ty - y
-    dist = math.sqrt(dx * dx + dy * dy)
+    # fraction of the vector to travel: one step of `speed`, but don’t overshoot
+    # (clamping the distance avoids 0/0 for drivers already at their target)
+    scale = np.minimum(COORD(1.0), speed / np.maximum(np.sqrt(dx * dx + dy * dy), COORD(1e-12)))
 
-    if dist < 1e-6:  # already at target
-        return
+    # update positions in place
+    drv_x += dx * scale
+    drv_y += dy * scale
 
-    # unit direction vector
-    ux = dx / dist
-    uy = dy / dist
 
-    # move at constant speed, but don’t overshoot
-    step = min(speed, dist)
+@njit(inline="always")
+def close_enough(x, y, tx, ty, tol2=ARRIVAL_TOL2):
+    # squared Euclidean distance vs. squared tolerance (no sqrt);
+    # works on scalars and element-wise on arrays
+    dx = x - tx
+    dy = y - ty
+    return dx * dx + dy * dy <= tol2
 
-    # update position
-    driver["x"] += ux * step
-    driver["y"] += uy * step
 
+# ======================================================
+# Compiled per-tick kernel
+# ======================================================
 
-def close_enough(driver, target, tol=0.5):
-    # Euclidean distance check
-    dx = driver["x"] - target[0]
-    dy = driver["y"] - target[1]
-    return math.sqrt(dx * dx + dy * dy) <= tol
+@njit(inline="always")
+def _nearest_free(x, y, drv_x, drv_y, free, n_free):
+    """
+    Returns the slot in ``free[:n_free]`` of the idle driver closest to (x, y).
+    """
+    best = 0
+    best_d2 = np.inf
+    for k in range(n_free):
+        d = free[k]
+        dx = drv_x[d] - x
+        dy = drv_y[d] - y
+        d2 = dx * dx + dy * dy
+        if d2 < best_d2:
+            best, best_d2 = k, d2
+    return best
+
+
+# (served, expired, n_waits, lo, n_free)
+#     (t, driver arrays, free, n_free, request arrays, lo, timeout, waits, n_waits)
+STEP_SIGNATURE = (
+    "Tuple((i8, i8, i8, i8, i8))(i8, f4[::1], f4[::1], f4[::1], f4[::1], i4[::1], i4[::1], i8,"
+    " f4[::1], f4[::1], f4[::1], f4[::1], i8[::1], i1[::1], i4[::1], i8, i8, i4[::1], i8)"
+)
+
+
+def step_kernel(t, drv_x, drv_y, drv_tx, drv_ty, drv_target, free, n_free,
+                req_px, req_py, req_dx, req_dy, req_t, req_status, req_driver,
+                lo, timeout, waits, n_waits):
+    """
+    Runs one tick, updating the arrays in place: a single pass over the
+    live requests expires them or assigns them to the nearest idle driver,
+    then all drivers move at once and arrivals trigger pickup/delivery.
+    Requests below index ``lo`` are finished tombstones and are skipped.
+    Idle drivers live on the stack ``free[:n_free]``: assignment pops,
+    expiry and delivery push. Wait times of delivered requests are appended
+    to ``waits[:n_waits]``, which must have room for one per driver.
+
+    Returns (served, expired, n_waits, lo, n_free) after this tick, with
+    ``lo`` advanced past any newly finished requests.
+    """
+    n_req = len(req_t)
+    served = 0
+    expired = 0
+
+    for r in range(lo, n_req):
+        status = req_status[r]
+
+        # expire old requests (only requests not yet picked up)
+        if status <= STATUS_ASSIGNED and t - req_t[r] > timeout:
+            req_status[r] = STATUS_EXPIRED
+            expired += 1
+
+            # free the driver that was heading to this pickup
+            d = req_driver[r]
+            if d != NO_ID:
+                drv_target[d] = NO_ID
+                drv_tx[d], drv_ty[d] = drv_x[d], drv_y[d]  # idle target = current pos
+                req_driver[r] = NO_ID                       # detach driver from request
+                free[n_free] = d
+                n_free += 1
+
+        elif status == STATUS_WAITING and n_free > 0:
+            # nearest idle driver takes it; fill its stack slot with the top
+            k = _nearest_free(req_px[r], req_py[r], drv_x, drv_y, free, n_free)
+            d = free[k]
+            n_free -= 1
+            free[k] = free[n_free]
+
+            req_status[r] = STATUS_ASSIGNED
+            req_driver[r] = d                              # link request -> driver
+            drv_target[d] = r                              # link driver -> request
+            drv_tx[d], drv_ty[d] = req_px[r], req_py[r]    # move toward pickup
+
+    # every driver takes one step toward (drv_tx, drv_ty)
+    move_drivers(drv_x, drv_y, drv_tx, drv_ty, DRIVER_SPEED)
+
+    # pickup/delivery for busy drivers that reached their target, as masks
+    arrived_d = np.flatnonzero((drv_target != NO_ID) & close_enough(drv_x, drv_y, drv_tx, drv_ty, ARRIVAL_TOL2))
+    arrived_r = drv_target[arrived_d]
+    pickup = req_status[arrived_r] == STATUS_ASSIGNED
+
+    # pickup done: head for the dropoff next
+    pd, pr = arrived_d[pickup], arrived_r[pickup]
+    req_status[pr] = STATUS_PICKED
+    drv_tx[pd] = req_dx[pr]
+    drv_ty[pd] = req_dy[pr]
+
+    # delivered (kept as a tombstone): record wait, free the driver
+    dd, dr = arrived_d[~pickup], arrived_r[~pickup]
+    n_done = len(dd)
+    req_status[dr] = STATUS_DELIVERED
+    waits[n_waits:n_waits + n_done] = t - req_t[dr]
+    n_waits += n_done
+    served += n_done
+
+    drv_target[dd] = NO_ID              # driver becomes free
+    drv_tx[dd] = drv_x[dd]              # idle target = current pos
+    drv_ty[dd] = drv_y[dd]
+    req_driver[dr] = NO_ID              # detach driver from request
+    free[n_free:n_free + n_done] = dd   # back on the idle stack
+    n_free += n_done
+
+    # skip the finished prefix from now on
+    while lo < n_req and (req_status[lo] == STATUS_EXPIRED or req_status[lo] == STATUS_DELIVERED):
+        lo += 1
+
+    return served, expired, n_waits, lo, n_free
+
+
+# Prefer the ahead-of-time build (``python -m phase1._sim_aot``); otherwise
+# compile at import for STEP_SIGNATURE (numba caches the result on disk).
+try:
+    from phase1.sim_aot import step_kernel as _step_kernel
+except ImportError:
+    _step_kernel = njit(STEP_SIGNATURE, cache=True)(step_kernel)